@@ -0,0 +1,71 @@
+"""Tests for vibe_scraping.html_processor text extraction."""
+
+from collections import OrderedDict
+
+import pytest
+from bs4 import BeautifulSoup
+
+from vibe_scraping import html_processor
+from vibe_scraping.html_processor import HTMLProcessor
+
+ENTITY_HTML = (
+    "<html><body><p>caf&eacute; na&iuml;ve</p>"
+    "<p>&lt;tag&gt; <b>bold</b>&amp;more</p>"
+    "<p>x<!-- c -->y</p>"
+    "<script>var x = 1;</script></body></html>"
+)
+
+
+def _baseline_text(html_content):
+    """Text as the BeautifulSoup path extracts it."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    return " ".join(soup.get_text(separator=" ").split())
+
+
+@pytest.mark.skipif(not html_processor.LXML_AVAILABLE, reason="lxml is not installed")
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_lxml_text_keeps_entities_inside_words(as_bytes):
+    html_content = ENTITY_HTML.encode("utf-8") if as_bytes else ENTITY_HTML
+    text = " ".join(html_processor._extract_text_lxml(html_content).split())
+
+    assert "café naïve" in text
+    assert "<tag>" in text
+    assert "x y" in text
+    assert "var x" not in text
+    assert text == _baseline_text(ENTITY_HTML)
+
+
+@pytest.mark.skipif(not html_processor.LXML_AVAILABLE, reason="lxml is not installed")
+def test_extract_text_without_selectolax_matches_baseline(monkeypatch, tmp_path):
+    monkeypatch.setattr(html_processor, "SELECTOLAX_AVAILABLE", False)
+    monkeypatch.setattr(html_processor, "_TEXT_CACHE", OrderedDict())
+    monkeypatch.setattr(html_processor, "_text_cache_chars", 0)
+    processor = HTMLProcessor(str(tmp_path))
+
+    text = processor.extract_text_from_html(ENTITY_HTML)
+
+    assert " ".join(text.split()) == _baseline_text(ENTITY_HTML)
+
+
+def test_text_cache_stays_within_character_budget(monkeypatch):
+    monkeypatch.setattr(html_processor, "_TEXT_CACHE", OrderedDict())
+    monkeypatch.setattr(html_processor, "_text_cache_chars", 0)
+    monkeypatch.setattr(html_processor, "_TEXT_CACHE_MAX_CHARS", 1600)
+
+    for i in range(10):
+        html_processor._cache_text(i, "x" * 100)
+
+    assert html_processor._text_cache_chars == 1000
+    assert list(html_processor._TEXT_CACHE) == list(range(10))
+
+    for i in range(10, 20):
+        html_processor._cache_text(i, "y" * 100)
+
+    assert html_processor._text_cache_chars <= 1600
+    assert list(html_processor._TEXT_CACHE) == list(range(4, 20))
+
+    # Texts too large for the budget are not cached at all
+    html_processor._cache_text("big", "z" * 1000)
+    assert "big" not in html_processor._TEXT_CACHE
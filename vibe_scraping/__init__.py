@@ -2,14 +2,33 @@
 
 __version__ = "0.3.0"
 
-from .crawler import WebCrawler, crawl_site
+import importlib
 
-# Import Scrapy adapter if available
-try:
-    from .scrapy_adapter import crawl_with_scrapy, SCRAPY_AVAILABLE
-except ImportError:
-    # Define a placeholder for SCRAPY_AVAILABLE if the module is not available
-    SCRAPY_AVAILABLE = False
+# The crawler pulls in Scrapy and Twisted, which take a while to import.
+# Load it on first use so code that only processes pages doesn't pay for it.
+_LAZY_ATTRS = {
+    'WebCrawler': '.crawler',
+    'crawl_site': '.crawler',
+    'crawl_with_scrapy': '.scrapy_adapter',
+    'crawl_with_scrapy_parallel': '.scrapy_adapter',
+    'SCRAPY_AVAILABLE': '.scrapy_adapter',
+}
+
+
+def __getattr__(name):
+    """Import crawler attributes the first time they are accessed."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError:
+        if name != 'SCRAPY_AVAILABLE':
+            raise
+        # Define a placeholder for SCRAPY_AVAILABLE if the module is not available
+        value = False
+    globals()[name] = value
+    return value
 
 # Import analyzer functions
 try:
@@ -32,6 +51,7 @@ __all__ = [
     'crawl_site',
     'SCRAPY_AVAILABLE',
     'crawl_with_scrapy',
+    'crawl_with_scrapy_parallel',
     'HTMLAnalyzer',
     'analyze_html_content',
     'HTMLProcessor',
@@ -19,6 +19,7 @@ def main():
     parser.add_argument('-d', '--depth', type=int, default=5, help='Max depth')
     parser.add_argument('-p', '--pages', type=int, default=1000, help='Max pages')
     parser.add_argument('--delay', type=float, default=0.1, help='Request delay')
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help='Max concurrent requests')
     parser.add_argument('-f', '--follow-external', action='store_true', help='Follow external links')
     parser.add_argument('-i', '--ignore-robots', action='store_true', help='Ignore robots.txt')
     
@@ -45,7 +46,8 @@ def main():
         follow_external_links=args.follow_external,
         respect_robots_txt=not args.ignore_robots,
         delay=args.delay,
-        save_path=args.output
+        save_path=args.output,
+        concurrent_requests=args.concurrency
     )
     
     # Run crawler
@@ -24,7 +24,10 @@ class WebCrawler:
         delay=0.1,
         save_path="./data/crawl_data",
         additional_settings=None,
-        force_fresh_crawl=True
+        force_fresh_crawl=True,
+        concurrent_requests=16,
+        per_domain_concurrency=8,
+        autothrottle=True
     ):
         self.start_url = start_url
         self.start_urls = []
@@ -48,6 +51,9 @@ class WebCrawler:
         self.save_path = save_path
         self.additional_settings = additional_settings or {}
         self.force_fresh_crawl = force_fresh_crawl
+        self.concurrent_requests = concurrent_requests
+        self.per_domain_concurrency = per_domain_concurrency
+        self.autothrottle = autothrottle
         
         os.makedirs(self.save_path, exist_ok=True)
         
@@ -74,12 +80,16 @@ class WebCrawler:
             delay=self.delay,
             additional_settings=self.additional_settings,
             enable_caching=False,  # Disable caching by default
-            force_recrawl=self.force_fresh_crawl
+            force_recrawl=self.force_fresh_crawl,
+            concurrent_requests=self.concurrent_requests,
+            per_domain_concurrency=self.per_domain_concurrency,
+            autothrottle=self.autothrottle
         )
 
 def crawl_site(start_url=None, start_urls=None, output_dir="crawled_data", max_depth=5, max_pages=1000, 
                delay=0.1, follow_external_links=False, respect_robots_txt=True, user_agent=None,
-               force_fresh_crawl=True):
+               force_fresh_crawl=True, concurrent_requests=16, per_domain_concurrency=8,
+               autothrottle=True):
     """Convenience function to crawl a website."""
     crawler = WebCrawler(
         start_url=start_url,
@@ -91,7 +101,10 @@ def crawl_site(start_url=None, start_urls=None, output_dir="crawled_data", max_d
         user_agent=user_agent,
         delay=delay,
         save_path=output_dir,
-        force_fresh_crawl=force_fresh_crawl
+        force_fresh_crawl=force_fresh_crawl,
+        concurrent_requests=concurrent_requests,
+        per_domain_concurrency=per_domain_concurrency,
+        autothrottle=autothrottle
     )
     
     return crawler.crawl()
@@ -4,10 +4,14 @@ Parses the metadata.json file and extracts text from crawled HTML.
 """
 
 import os
-import json
 import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString
 from collections import Counter
 import logging
 from typing import Callable, Dict, List, Any, Optional
@@ -15,6 +19,229 @@ from typing import Callable, Dict, List, Any, Optional
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Tags whose content is never part of the readable text
+_STRIP_TAGS = ["script", "style", "noscript", "iframe", "svg"]
+
+# Matches whole script-like blocks so they can be cut out before a full
+# BeautifulSoup parse; they are often the bulk of a modern page
+_STRIP_BLOCKS_PATTERN = r'<({0})\b[^>]*>.*?</\1\s*>'.format('|'.join(_STRIP_TAGS))
+_STRIP_BLOCKS_RE = re.compile(_STRIP_BLOCKS_PATTERN, re.IGNORECASE | re.DOTALL)
+_STRIP_BLOCKS_BYTES_RE = re.compile(_STRIP_BLOCKS_PATTERN.encode(), re.IGNORECASE | re.DOTALL)
+
+# selectolax (Lexbor engine) is optional, used for fast text extraction
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Prefer the lxml tree builder for BeautifulSoup when it is installed
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+    BS4_FEATURES = 'lxml'
+except ImportError:
+    LXML_AVAILABLE = False
+    BS4_FEATURES = 'html.parser'
+
+# orjson is optional, it parses and writes the JSON files several times faster
+try:
+    import orjson
+
+    def _dumps(obj):
+        """Serialize obj to indented JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_line(obj):
+        """Serialize obj to one newline-terminated line of JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        """Serialize obj to indented JSON bytes."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _dumps_line(obj):
+        """Serialize obj to one newline-terminated line of JSON bytes."""
+        return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+    _loads = json.loads
+
+class _TextTarget:
+    """
+    lxml parser target that collects text outside of script-like tags.
+    
+    No tree is built: libxml2 streams events straight into this object.
+    libxml2 splits a text node at entity references, so consecutive data()
+    calls are joined without a separator; only tag, comment and processing
+    instruction boundaries become spaces, as with get_text(separator=' ').
+    """
+    
+    SKIP = frozenset(_STRIP_TAGS)
+    
+    def __init__(self):
+        self.parts = []
+        self.run = []
+        self.skip_depth = 0
+    
+    def _end_text(self):
+        if self.run:
+            self.parts.append(''.join(self.run))
+            self.run.clear()
+    
+    def start(self, tag, attrib):
+        self._end_text()
+        if tag in self.SKIP:
+            self.skip_depth += 1
+    
+    def end(self, tag):
+        self._end_text()
+        if tag in self.SKIP:
+            self.skip_depth -= 1
+    
+    def comment(self, text):
+        self._end_text()
+    
+    def pi(self, target, data=None):
+        self._end_text()
+    
+    def data(self, data):
+        if not self.skip_depth:
+            self.run.append(data)
+    
+    def close(self):
+        self._end_text()
+        return ' '.join(self.parts)
+
+def _extract_text_lxml(html_content):
+    """Extract raw text with a streaming lxml parse, or None if lxml can't parse it."""
+    # Saved pages are always UTF-8, whatever their <meta charset> says
+    encoding = 'utf-8' if isinstance(html_content, bytes) else None
+    parser = etree.HTMLParser(target=_TextTarget(), encoding=encoding)
+    try:
+        return etree.fromstring(html_content, parser)
+    except (ValueError, etree.LxmlError):
+        return None
+
+def _soup_text(soup):
+    """
+    Join the text nodes of a parsed document with spaces.
+    
+    Same strings as soup.get_text(separator=' ') (comments, doctypes and other
+    NavigableString subclasses are skipped), without its per-node generator
+    and type checks.
+    """
+    parts = []
+    append = parts.append
+    for node in soup.descendants:
+        node_type = type(node)
+        if node_type is NavigableString or node_type is CData:
+            append(node)
+    return ' '.join(parts)
+
+def read_page_html(page_dir, as_bytes=False):
+    """
+    Read the saved HTML of a crawled page.
+    
+    Handles plain page.html as well as compressed page.html.zst (zstd) and
+    page.html.gz (gzip) files.
+    
+    Args:
+        page_dir: Directory of the crawled page
+        as_bytes: Return the raw UTF-8 bytes instead of decoding them
+        
+    Returns:
+        HTML content as string (or bytes), or None if no HTML file exists
+    """
+    page_dir = Path(page_dir)
+    html_path = page_dir / "page.html"
+    zst_path = page_dir / "page.html.zst"
+    gz_path = page_dir / "page.html.gz"
+    if html_path.exists():
+        with open(html_path, 'rb') as f:
+            data = f.read()
+    elif zst_path.exists():
+        import zstandard
+        with open(zst_path, 'rb') as f:
+            data = zstandard.ZstdDecompressor().decompress(f.read())
+    elif gz_path.exists():
+        import gzip
+        with open(gz_path, 'rb') as f:
+            data = gzip.decompress(f.read())
+    else:
+        return None
+    
+    return data if as_bytes else data.decode('utf-8', errors='replace')
+
+# Extracted text keyed by a digest of the HTML, shared by all processors in
+# this process. Templated sites produce many byte-identical pages. Bounded by
+# entry count and by total characters, so a run of multi-MB pages can't pin
+# hundreds of MB of text.
+_TEXT_CACHE = OrderedDict()
+_TEXT_CACHE_SIZE = 4096
+_TEXT_CACHE_MAX_CHARS = 32 * 1024 * 1024
+_text_cache_chars = 0
+_text_cache_lock = threading.Lock()
+
+def _cache_text(key, text):
+    """Add extracted text to the cache, evicting the oldest entries over budget."""
+    global _text_cache_chars
+    if len(text) > _TEXT_CACHE_MAX_CHARS // 16:
+        return
+    with _text_cache_lock:
+        old = _TEXT_CACHE.pop(key, None)
+        if old is not None:
+            _text_cache_chars -= len(old)
+        _TEXT_CACHE[key] = text
+        _text_cache_chars += len(text)
+        while len(_TEXT_CACHE) > _TEXT_CACHE_SIZE or _text_cache_chars > _TEXT_CACHE_MAX_CHARS:
+            _, evicted = _TEXT_CACHE.popitem(last=False)
+            _text_cache_chars -= len(evicted)
+
+def _content_key(html_content):
+    """Digest of raw HTML used as the text cache key."""
+    if isinstance(html_content, str):
+        html_content = html_content.encode('utf-8', errors='replace')
+    return hashlib.blake2b(html_content, digest_size=16).digest()
+
+def _default_workers():
+    """Worker count from the VIBE_ANALYZE_WORKERS env var, or the number of CPUs."""
+    try:
+        return max(1, int(os.environ["VIBE_ANALYZE_WORKERS"]))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+def _process_page_worker(task):
+    """
+    Process one page in a worker process.
+    
+    Defined at module level so it can be pickled; only paths and the plain
+    result dict cross the process boundary, never BeautifulSoup objects.
+    
+    Args:
+        task: Tuple of (crawl_data_path, url, hash_value, depth)
+        
+    Returns:
+        Tuple of (url, result)
+    """
+    crawl_data_path, url, hash_value, depth = task
+    return url, HTMLProcessor(crawl_data_path).process_page(url, hash_value, depth)
+
+def _custom_processor_worker(task):
+    """
+    Apply a custom processor to one page in a worker process.
+    
+    Args:
+        task: Tuple of (crawl_data_path, processor_func, url, hash_value)
+        
+    Returns:
+        Tuple of (url, processed, result)
+    """
+    crawl_data_path, processor_func, url, hash_value = task
+    processor = HTMLProcessor(crawl_data_path)
+    return (url,) + processor._apply_processor(processor_func, url, hash_value)
+
 class HTMLProcessor:
     """Processor for extracting and processing text from crawled HTML files."""
     
@@ -36,8 +263,8 @@ class HTMLProcessor:
             raise FileNotFoundError(f"Metadata file not found at {self.metadata_path}")
         
         logger.info(f"Loading metadata from {self.metadata_path}")
-        with open(self.metadata_path, 'r', encoding='utf-8') as f:
-            self.metadata = json.load(f)
+        with open(self.metadata_path, 'rb') as f:
+            self.metadata = _loads(f.read())
         
         return self.metadata
     
@@ -46,74 +273,138 @@ class HTMLProcessor:
         Extract readable text from HTML content.
         
         Args:
-            html_content: Raw HTML content as string
+            html_content: Raw HTML content as string or UTF-8 bytes, or an already parsed
+                BeautifulSoup object (its script/style tags are removed in place)
             
         Returns:
             Extracted text string with extra whitespace removed
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if isinstance(html_content, BeautifulSoup):
+            return self._extract_text(html_content)
         
-        # Remove script and style elements
-        for script in soup(["script", "style", "noscript", "iframe", "svg"]):
-            script.extract()
+        # Identical pages are only parsed once
+        key = _content_key(html_content)
+        with _text_cache_lock:
+            text = _TEXT_CACHE.get(key)
+            if text is not None:
+                _TEXT_CACHE.move_to_end(key)
+        if text is not None:
+            return text
         
-        # Extract text
-        text = soup.get_text(separator=' ')
+        text = self._extract_text(html_content)
+        _cache_text(key, text)
+        
+        return text
+    
+    def _extract_text(self, html_content):
+        """Parse HTML content (string or BeautifulSoup) and return its cleaned text."""
+        if isinstance(html_content, BeautifulSoup):
+            soup = html_content
+            
+            # Remove script and style elements
+            for script in soup(_STRIP_TAGS):
+                script.decompose()
+            
+            text = _soup_text(soup)
+        elif SELECTOLAX_AVAILABLE:
+            tree = LexborHTMLParser(html_content)
+            
+            # Remove script and style elements
+            for node in tree.css(", ".join(_STRIP_TAGS)):
+                node.decompose()
+            
+            # Extract text
+            text = tree.root.text(separator=' ') if tree.root else ''
+        else:
+            # Stream the text out of lxml without building a tree
+            text = _extract_text_lxml(html_content) if LXML_AVAILABLE else None
+            
+            if text is None:
+                if isinstance(html_content, bytes):
+                    encoding = 'utf-8'
+                    html_content = _STRIP_BLOCKS_BYTES_RE.sub(b' ', html_content)
+                else:
+                    encoding = None
+                    html_content = _STRIP_BLOCKS_RE.sub(' ', html_content)
+                soup = BeautifulSoup(html_content, BS4_FEATURES, from_encoding=encoding)
+                
+                # Remove script and style elements the pre-pass missed
+                # (e.g. unclosed tags)
+                for script in soup(_STRIP_TAGS):
+                    script.decompose()
+                
+                # Extract text
+                text = _soup_text(soup)
         
-        # Clean up text: remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Clean up text: remove extra whitespace. str.split() without
+        # arguments splits on the same characters as \s and runs in C
+        text = ' '.join(text.split())
         
         return text
     
-    def get_page_content(self, url, hash_value):
+    def get_page_content(self, url, hash_value, with_soup=True, as_bytes=False, with_metadata=True):
         """
         Get raw HTML content and metadata for a page.
         
         Args:
             url: The URL of the page
             hash_value: The hash directory name containing the page data
+            with_soup: Parse the HTML into a BeautifulSoup object. Callers that only
+                need the raw HTML pass False to skip the parse ("soup" is then None).
+            as_bytes: Return "html_content" as undecoded UTF-8 bytes (requires
+                with_soup=False)
+            with_metadata: Load the page's metadata.json (otherwise "metadata" is None)
             
         Returns:
             Dictionary with page content and metadata
         """
         page_dir = self.crawl_data_path / hash_value
-        html_path = page_dir / "page.html"
         page_metadata_path = page_dir / "metadata.json"
         
-        if not html_path.exists():
-            logger.warning(f"HTML file not found for {url} at {html_path}")
+        # Load HTML
+        html_content = read_page_html(page_dir, as_bytes=as_bytes)
+        if html_content is None:
+            logger.warning(f"HTML file not found for {url} in {page_dir}")
             return None
         
         # Load page metadata
-        with open(page_metadata_path, 'r', encoding='utf-8') as f:
-            page_metadata = json.load(f)
-        
-        # Load HTML
-        with open(html_path, 'r', encoding='utf-8', errors='replace') as f:
-            html_content = f.read()
+        page_metadata = None
+        if with_metadata:
+            with open(page_metadata_path, 'rb') as f:
+                page_metadata = _loads(f.read())
         
         return {
             "url": url,
             "html_content": html_content,
             "metadata": page_metadata,
-            "soup": BeautifulSoup(html_content, 'html.parser')
+            "soup": BeautifulSoup(html_content, BS4_FEATURES) if with_soup else None
         }
     
-    def process_page(self, url, hash_value):
+    def process_page(self, url, hash_value, depth=None, page_data=None):
         """
         Process a single page from the crawl data using the default processor.
         
         Args:
             url: The URL of the page
             hash_value: The hash directory name containing the page data
+            depth: Crawl depth of the page if already known (e.g. from the global
+                metadata); the page's own metadata.json is only read when it is None
+            page_data: Page data already read by get_page_content, if any
             
         Returns:
             Dictionary with processing results for the page
         """
-        page_data = self.get_page_content(url, hash_value)
+        # The text extractor parses the raw bytes itself, don't decode them
+        # or build a soup here too
+        if page_data is None:
+            page_data = self.get_page_content(url, hash_value, with_soup=False, as_bytes=True,
+                                              with_metadata=depth is None)
         if not page_data:
             return None
         
+        if depth is None:
+            depth = page_data["metadata"].get("depth", 0)
+        
         # Extract text
         text = self.extract_text_from_html(page_data["html_content"])
         
@@ -127,19 +418,168 @@ class HTMLProcessor:
             "text_length": len(text),
             "word_count": word_count,
             "char_count": char_count,
-            "crawl_depth": page_data["metadata"].get("depth", 0),
+            "crawl_depth": depth,
             "extracted_text": text
         }
         
         return result
     
-    def apply_custom_processor(self, processor_func: Callable, urls: Optional[List[str]] = None) -> Dict[str, Any]:
+    def process_all(self, max_workers=None, text_output_path=None):
+        """
+        Process all crawled pages with the default processor.
+        
+        HTML parsing is CPU-bound, so pages are spread over a process pool.
+        
+        Args:
+            max_workers: Number of worker processes (default: VIBE_ANALYZE_WORKERS
+                or the number of CPUs). Use 1 to process pages in the current process.
+            text_output_path: If given, each page's extracted text is appended to this
+                file as a JSON line ({"url", "extracted_text"}) as soon as the page is
+                processed, and left out of the in-memory results. This keeps memory
+                flat on large crawls.
+            
+        Returns:
+            Dictionary mapping URLs to their processing results
+        """
+        if not self.metadata:
+            self.load_metadata()
+        
+        crawled_urls = self.metadata.get("crawled_urls", {})
+        tasks = [
+            (str(self.crawl_data_path), url, data["hash"], data.get("depth"))
+            for url, data in crawled_urls.items()
+            if data.get("hash")
+        ]
+        
+        max_workers = max_workers or _default_workers()
+        logger.info(f"Processing {len(tasks)} pages with {max_workers} worker(s)")
+        
+        text_file = None
+        if text_output_path:
+            os.makedirs(os.path.dirname(os.path.abspath(text_output_path)), exist_ok=True)
+            text_file = open(text_output_path, 'wb')
+        
+        results = {}
+        pool = None
+        try:
+            if max_workers == 1 or len(tasks) < 2:
+                processed = self._process_prefetched(tasks)
+            else:
+                # Each worker process reads its own pages, so disk I/O already
+                # overlaps with parsing in the other workers
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+                processed = pool.map(_process_page_worker, tasks, chunksize=16)
+            
+            for url, result in processed:
+                if not result:
+                    continue
+                if text_file:
+                    text_file.write(_dumps_line({"url": url, "extracted_text": result.pop("extracted_text")}))
+                results[url] = result
+        finally:
+            if pool:
+                pool.shutdown()
+            if text_file:
+                text_file.close()
+        
+        self.results = results
+        return results
+    
+    def _process_prefetched(self, tasks):
+        """
+        Process pages in this process while the next ones are read on I/O threads.
+        
+        Args:
+            tasks: List of (crawl_data_path, url, hash_value, depth) tuples
+            
+        Yields:
+            Tuples of (url, result)
+        """
+        depths = {url: depth for _, url, _, depth in tasks}
+        pages = self._prefetch_pages(
+            ((url, hash_value) for _, url, hash_value, _ in tasks),
+            as_bytes=True,
+            with_metadata=None in depths.values()
+        )
+        for url, hash_value, page_data in pages:
+            if not page_data:
+                yield url, None
+                continue
+            yield url, self.process_page(url, hash_value, depths[url], page_data)
+    
+    def _prefetch_pages(self, pages, window=32, io_workers=8, **content_kwargs):
+        """
+        Read pages from disk ahead of the caller on a small thread pool.
+        
+        File reads release the GIL, so up to `window` pages are loaded in the
+        background while the caller parses the current one.
+        
+        Args:
+            pages: Iterable of (url, hash_value) tuples
+            window: Maximum number of pages read ahead
+            io_workers: Number of reader threads
+            content_kwargs: Extra keyword arguments for get_page_content
+            
+        Yields:
+            Tuples of (url, hash_value, page_data) in input order; page_data is
+            loaded without a soup and may be None
+        """
+        with ThreadPoolExecutor(max_workers=io_workers) as pool:
+            pending = deque()
+            for url, hash_value in pages:
+                future = pool.submit(self.get_page_content, url, hash_value,
+                                     with_soup=False, **content_kwargs)
+                pending.append((url, hash_value, future))
+                if len(pending) >= window:
+                    url, hash_value, future = pending.popleft()
+                    yield url, hash_value, future.result()
+            while pending:
+                url, hash_value, future = pending.popleft()
+                yield url, hash_value, future.result()
+    
+    def _apply_processor(self, processor_func: Callable, url: str, hash_value: str, page_data=None):
+        """
+        Load one page and apply a custom processor function to it.
+        
+        Args:
+            page_data: Page data already read by get_page_content; its soup
+                is built here if missing
+        
+        Returns:
+            Tuple of (processed, result); processed is False if the page could
+            not be loaded or the processor raised
+        """
+        if page_data is None:
+            page_data = self.get_page_content(url, hash_value)
+        if not page_data:
+            return False, None
+        if page_data["soup"] is None:
+            page_data["soup"] = BeautifulSoup(page_data["html_content"], BS4_FEATURES)
+        
+        try:
+            # Apply the custom processor function
+            result = processor_func(
+                url=url,
+                html_content=page_data["html_content"],
+                soup=page_data["soup"],
+                metadata=page_data["metadata"]
+            )
+            return True, result
+        except Exception as e:
+            logger.error(f"Error processing URL {url}: {str(e)}")
+            return False, None
+    
+    def apply_custom_processor(self, processor_func: Callable, urls: Optional[List[str]] = None,
+                               max_workers: int = 1) -> Dict[str, Any]:
         """
         Apply a custom processor function to selected URLs or all URLs.
         
         Args:
             processor_func: A function that takes (url, html_content, soup, metadata) and returns a result
             urls: List of URLs to process (if None, processes all URLs)
+            max_workers: Number of worker processes (default: 1, in-process). With more
+                than one worker processor_func must be picklable (a module-level function).
+                Pass 0 to use VIBE_ANALYZE_WORKERS or the number of CPUs.
             
         Returns:
             Dictionary mapping URLs to their processing results
@@ -157,32 +597,33 @@ class HTMLProcessor:
         total_urls = len(urls_to_process)
         logger.info(f"Starting custom processing of {total_urls} URLs")
         
-        results = {}
-        for i, url in enumerate(urls_to_process):
-            if i % 10 == 0:
-                logger.info(f"Processing URL {i+1}/{total_urls}")
-            
+        tasks = []
+        for url in urls_to_process:
             hash_value = crawled_urls[url].get("hash")
             if not hash_value:
                 logger.warning(f"No hash found for URL: {url}")
                 continue
-            
-            page_data = self.get_page_content(url, hash_value)
-            if not page_data:
-                continue
-            
-            try:
-                # Apply the custom processor function
-                result = processor_func(
-                    url=url,
-                    html_content=page_data["html_content"],
-                    soup=page_data["soup"],
-                    metadata=page_data["metadata"]
-                )
-                results[url] = result
-            except Exception as e:
-                logger.error(f"Error processing URL {url}: {str(e)}")
-                continue
+            tasks.append((str(self.crawl_data_path), processor_func, url, hash_value))
+        
+        if max_workers == 0:
+            max_workers = _default_workers()
+        
+        results = {}
+        if max_workers <= 1 or len(tasks) < 2:
+            pages = ((url, hash_value) for _, _, url, hash_value in tasks)
+            for i, (url, hash_value, page_data) in enumerate(self._prefetch_pages(pages)):
+                if i % 10 == 0:
+                    logger.info(f"Processing URL {i+1}/{total_urls}")
+                if not page_data:
+                    continue
+                processed, result = self._apply_processor(processor_func, url, hash_value, page_data)
+                if processed:
+                    results[url] = result
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                for url, processed, result in pool.map(_custom_processor_worker, tasks, chunksize=16):
+                    if processed:
+                        results[url] = result
         
         self.results = results
         return results
@@ -204,18 +645,37 @@ class HTMLProcessor:
             "crawl_date": self.metadata.get("last_crawl", "Unknown") if self.metadata else "Unknown"
         }
         
-        # Try to extract common fields if they exist in results
-        if all("word_count" in result for result in self.results.values()):
-            total_words = sum(result["word_count"] for result in self.results.values())
+        # Try to extract common fields if they exist in results. A single pass
+        # accumulates all of them; a field is dropped as soon as a result lacks it
+        total_words = total_chars = 0
+        depths = Counter()
+        has_words = has_chars = has_depths = True
+        for result in self.results.values():
+            if has_words:
+                if "word_count" in result:
+                    total_words += result["word_count"]
+                else:
+                    has_words = False
+            if has_chars:
+                if "char_count" in result:
+                    total_chars += result["char_count"]
+                else:
+                    has_chars = False
+            if has_depths:
+                if "crawl_depth" in result:
+                    depths[result["crawl_depth"]] += 1
+                else:
+                    has_depths = False
+        
+        if has_words:
             stats["total_words"] = total_words
-            stats["average_words_per_page"] = total_words / len(self.results) if self.results else 0
+            stats["average_words_per_page"] = total_words / len(self.results)
             
-        if all("char_count" in result for result in self.results.values()):
-            stats["total_characters"] = sum(result["char_count"] for result in self.results.values())
+        if has_chars:
+            stats["total_characters"] = total_chars
             
-        if all("crawl_depth" in result for result in self.results.values()):
-            depths = [result["crawl_depth"] for result in self.results.values()]
-            stats["depth_distribution"] = Counter(depths)
+        if has_depths:
+            stats["depth_distribution"] = depths
         
         return stats
     
@@ -238,8 +698,8 @@ class HTMLProcessor:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(_dumps(output))
         
         logger.info(f"Processing results saved to {output_path}")
 
@@ -265,20 +725,7 @@ def process_html_content(crawl_data_path="./data/crawl_data",
         processor.apply_custom_processor(processor_func)
     else:
         # Use default processor
-        metadata = processor.metadata
-        crawled_urls = metadata.get("crawled_urls", {})
-        
-        results = {}
-        for url, data in crawled_urls.items():
-            hash_value = data.get("hash")
-            if not hash_value:
-                continue
-                
-            result = processor.process_page(url, hash_value)
-            if result:
-                results[url] = result
-        
-        processor.results = results
+        processor.process_all()
     
     stats = processor.get_statistics()
     processor.save_results(output_path)
@@ -6,6 +6,11 @@ import os
 import time
 import random
 import logging
+import threading
+from collections import defaultdict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,6 +19,20 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Prefer the lxml tree builder for BeautifulSoup when it is installed
+try:
+    import lxml  # noqa: F401
+    BS4_FEATURES = 'lxml'
+except ImportError:
+    BS4_FEATURES = 'html.parser'
+
+# Long-lived session so repeated scrape_webpage calls reuse open connections
+# instead of paying a TCP + TLS handshake per call
+_SESSION = requests.Session()
+
+# Selenium fallbacks of scrape_webpages run one browser at a time
+_SELENIUM_LIMIT = threading.BoundedSemaphore(1)
+
 # Model pricing (per million tokens)
 MODEL_PRICING = {
     # Meta models
@@ -21,13 +40,57 @@ MODEL_PRICING = {
     "meta-llama/llama-4-maverick-17b-128e-instruct": {"input": 0.20, "output": 0.60},
 }
 
-def scrape_webpage(url, max_retries=3, use_selenium_fallback=True):
+def _scrape_with_selenium_fallback(url, headless=False):
+    """Scrape a page's text with Selenium.
+    
+    Args:
+        url: URL to scrape
+        headless: Whether to run Chrome in headless mode
+    
+    Returns:
+        Extracted text content or None if failed
+    """
+    try:
+        logger.info("Attempting to scrape with Selenium (headless Chrome)...")
+        
+        # Import the Selenium scraper (only when needed to avoid dependencies)
+        from .selenium_scraper import scrape_with_selenium
+        
+        # Get the HTML with Selenium
+        html_content = scrape_with_selenium(url, headless=headless)
+        
+        if html_content and len(html_content) > 0:
+            # Parse the HTML with BeautifulSoup
+            soup = BeautifulSoup(html_content, BS4_FEATURES)
+            
+            # Clean up the content
+            for script in soup(["script", "style"]):
+                script.decompose()
+            
+            # Extract text
+            text = soup.get_text(separator=' ', strip=True)
+            logger.info(f"Successfully retrieved {len(text)} characters using Selenium")
+            
+            return text
+        else:
+            logger.error("Failed to retrieve content with Selenium")
+    
+    except ImportError:
+        logger.error("Selenium is not installed. To use the Selenium fallback, install selenium and webdriver-manager.")
+    except Exception as e:
+        logger.error(f"Error during Selenium scraping: {str(e)}")
+    
+    return None
+
+def scrape_webpage(url, max_retries=3, use_selenium_fallback=True, session=None, request_limit=None):
     """Scrape content from a webpage, mimicking a real browser.
     
     Args:
         url: URL to scrape
         max_retries: Maximum number of retry attempts
         use_selenium_fallback: Whether to try Selenium if regular requests fail
+        session: Optional requests.Session to use instead of the shared module session
+        request_limit: Optional semaphore held only while each request is in flight
     
     Returns:
         Extracted text content or None if failed
@@ -62,17 +125,27 @@ def scrape_webpage(url, max_retries=3, use_selenium_fallback=True):
             
             # Add a slight delay between retries to avoid triggering rate limits
             if attempt > 0:
-                time.sleep(2 + random.random() * 3)  # Sleep 2-5 seconds between retries
+                time.sleep(random.uniform(2, 5))  # Sleep 2-5 seconds between retries
             
             # Make the request with headers to appear more like a real browser
-            response = requests.get(url, headers=headers, timeout=10)
+            with request_limit or nullcontext():
+                response = (session or _SESSION).get(url, headers=headers, timeout=10, stream=False)
+            response.close()  # Body is already read, return the connection to the pool
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                # Decode with the declared charset instead of response.text,
+                # which runs charset detection over the whole body when none is declared
+                encoding = response.encoding or 'utf-8'
+                try:
+                    html_content = response.content.decode(encoding, errors='replace')
+                except LookupError:
+                    html_content = response.content.decode('utf-8', errors='replace')
+                
+                soup = BeautifulSoup(html_content, BS4_FEATURES)
                 
                 # Check if we need to clean up the content (remove scripts, styles, etc.)
                 for script in soup(["script", "style"]):
-                    script.extract()
+                    script.decompose()
                 
                 # Get the text
                 text = soup.get_text(separator=' ', strip=True)
@@ -104,39 +177,63 @@ def scrape_webpage(url, max_retries=3, use_selenium_fallback=True):
     
     # If we get here and use_selenium_fallback is True, try with Selenium
     if use_selenium_fallback:
-        try:
-            logger.info("Attempting to scrape with Selenium (headless Chrome)...")
-            
-            # Import the Selenium scraper (only when needed to avoid dependencies)
-            from .selenium_scraper import scrape_with_selenium
-            
-            # Get the HTML with Selenium
-            html_content = scrape_with_selenium(url)
-            
-            if html_content and len(html_content) > 0:
-                # Parse the HTML with BeautifulSoup
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Clean up the content
-                for script in soup(["script", "style"]):
-                    script.extract()
-                
-                # Extract text
-                text = soup.get_text(separator=' ', strip=True)
-                logger.info(f"Successfully retrieved {len(text)} characters using Selenium")
-                
-                return text
-            else:
-                logger.error("Failed to retrieve content with Selenium")
-        
-        except ImportError:
-            logger.error("Selenium is not installed. To use the Selenium fallback, install selenium and webdriver-manager.")
-        except Exception as e:
-            logger.error(f"Error during Selenium scraping: {str(e)}")
+        text = _scrape_with_selenium_fallback(url)
+        if text is not None:
+            return text
     
     logger.error(f"Failed to retrieve the page after all attempts")
     return None
 
+def scrape_webpages(urls, max_workers=32, per_host=4, max_retries=3, use_selenium_fallback=False):
+    """Scrape several webpages concurrently.
+    
+    Fetching is network-bound, so pages are scraped on a thread pool sharing
+    one requests.Session (connections are kept alive and reused). At most
+    `per_host` requests run against the same host at a time.
+    
+    The Selenium fallback is off by default for batches. When enabled, it runs
+    outside the per-host limit, one headless browser at a time.
+    
+    Args:
+        urls: URLs to scrape
+        max_workers: Maximum number of concurrent requests
+        per_host: Maximum number of concurrent requests per host
+        max_retries: Maximum number of retry attempts per URL
+        use_selenium_fallback: Whether to try Selenium for pages that fail or look incomplete
+    
+    Returns:
+        Dictionary mapping each URL to its extracted text, or None if it failed
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    
+    max_workers = max(1, min(max_workers, len(urls)))
+    host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+    limits_lock = threading.Lock()
+    
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        
+        def scrape_one(url):
+            with limits_lock:
+                host_limit = host_limits[urlparse(url).netloc]
+            # The host slot is only held while a request is in flight, not
+            # through retry sleeps or the Selenium fallback
+            text = scrape_webpage(url, max_retries=max_retries, use_selenium_fallback=False,
+                                  session=session, request_limit=host_limit)
+            
+            # Same criterion as scrape_webpage's own fallback
+            if use_selenium_fallback and (text is None or len(text) <= 500):
+                with _SELENIUM_LIMIT:
+                    text = _scrape_with_selenium_fallback(url, headless=True)
+            return text
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(urls, executor.map(scrape_one, urls)))
+
 def extract_product_info(text, model="meta-llama/llama-4-scout-17b-16e-instruct", custom_prompt=None, max_retries=3):
     """Extract product information using Groq API.
     
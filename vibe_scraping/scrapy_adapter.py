@@ -5,12 +5,14 @@ This module provides a Scrapy-based crawler implementation focused on deep web c
 """
 
 import os
+import gzip
 import json
 import logging
+import threading
 import time
 from datetime import datetime
 import hashlib
-from urllib.parse import urlparse, urldefrag
+import re
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -20,17 +22,140 @@ logger = logging.getLogger(__name__)
 try:
     import scrapy
     from scrapy.crawler import CrawlerProcess
-    from scrapy.spiders import CrawlSpider, Rule
-    from scrapy.linkextractors import LinkExtractor
     from scrapy.exceptions import NotConfigured
+    from twisted.internet import threads
     SCRAPY_AVAILABLE = True
 except ImportError:
     SCRAPY_AVAILABLE = False
     logger.warning("Scrapy is not installed. Install with: pip install scrapy")
 
+# orjson is optional, it makes metadata (de)serialization several times faster
+try:
+    import orjson
+
+    def _dumps_line(obj):
+        """Serialize obj to one compact, newline-terminated line of JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps_line(obj):
+        """Serialize obj to one compact, newline-terminated line of JSON bytes."""
+        return (json.dumps(obj, separators=(',', ':')) + '\n').encode('utf-8')
+
+    _loads = json.loads
+
+# xxHash is optional, it only speeds up naming of page directories
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+def _url_hash(url, legacy=False):
+    """
+    Derive the page directory name for a URL.
+    
+    The hash is only used as a filesystem-safe name, so a fast non-cryptographic
+    hash is preferred: 128-bit XXH3 when xxhash is installed, otherwise BLAKE2b,
+    which hashlib computes faster than MD5. MD5 is kept for compatibility with
+    older crawl directories.
+    
+    Args:
+        url: URL of the crawled page
+        legacy: Use MD5 names as older versions did
+        
+    Returns:
+        Hex digest string (32 characters)
+    """
+    if legacy:
+        return hashlib.md5(url.encode()).hexdigest()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(url)
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+# zstandard is optional, used to compress saved HTML
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# A scalable Bloom filter keeps the seen-URL index small on very large crawls
+try:
+    from pybloom_live import ScalableBloomFilter
+    BLOOM_AVAILABLE = True
+except ImportError:
+    BLOOM_AVAILABLE = False
+
+
+def _new_seen_set():
+    """
+    Create the container used to remember URLs scheduled during a crawl.
+    
+    Uses a ScalableBloomFilter when pybloom_live is installed, otherwise a plain
+    set. A false positive silently drops a page, so the error rate is kept at
+    one in a million; that costs about twice the bits of 0.1%, still far below
+    a set of URL keys.
+    """
+    if BLOOM_AVAILABLE:
+        return ScalableBloomFilter(initial_capacity=100000, error_rate=1e-6)
+    return set()
+
+def _url_key(url):
+    """
+    Key used for a URL in the seen set.
+    
+    A 64-bit xxhash integer is much smaller than the URL string it stands for;
+    without xxhash the URL itself is used.
+    """
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh64_intdigest(url)
+    return url
+
+# File extensions that are never worth downloading as pages.
+# Kept as a tuple so str.endswith can check all of them in one call.
+_SKIP_EXTS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.pdf', '.doc', '.docx', '.xls', '.xlsx',
+    '.zip', '.tar', '.gz', '.mp3', '.mp4', '.avi'
+)
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def _write_file(path, data):
+    """
+    Write bytes to a file with raw os calls.
+    
+    The data is already complete in memory, so Python's buffered file object
+    would only add a copy and extra flush/close work per file.
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+# Scheme and host name of an absolute URL, matched in one pass. Userinfo and
+# port are skipped, like urlparse(url).hostname that Scrapy's offsite check uses
+_NETLOC_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*)://(?:[^/?#]*@)?(\[[^\]/?#]*\]|[^:/?#]*)')
+
+
+def _netloc(url):
+    """Return the lowercased host name of an absolute URL, or '' if it has none."""
+    m = _NETLOC_RE.match(url)
+    return m.group(2).lower() if m else ''
+
+# XPath for all link targets on a page; same result as the CSS selector
+# 'a::attr(href)' without translating CSS to XPath on every page
+_LINKS_XPATH = '//a/@href'
+
 # Only define the spider class if Scrapy is available
 if SCRAPY_AVAILABLE:
-    class VibeCrawlSpider(CrawlSpider):
+    class VibeCrawlSpider(scrapy.Spider):
         """Scrapy spider for deep web crawling."""
         
         name = "vibe_scraper"
@@ -45,6 +170,17 @@ if SCRAPY_AVAILABLE:
             self.respect_robots = kwargs.pop('respect_robots', True)
             self.save_path = kwargs.pop('save_path', 'crawled_data')
             self.force_recrawl = kwargs.pop('force_recrawl', True)
+            self.legacy_url_hash = kwargs.pop('legacy_url_hash', False)
+            self.compress_html = kwargs.pop('compress_html', False)
+            
+            # One compressor is reused for every page of the crawl
+            self._zstd = None
+            if self.compress_html:
+                if ZSTD_AVAILABLE:
+                    self._zstd = zstandard.ZstdCompressor(level=3)
+                else:
+                    logger.info("zstandard is not installed, compressing HTML with gzip. "
+                                "Install zstandard for faster compression: pip install zstandard")
             
             # Setup the start URLs first - before accessing them in _load_metadata
             if self.start_url and self.start_url not in start_urls:
@@ -58,50 +194,66 @@ if SCRAPY_AVAILABLE:
             # Initialize metadata
             self.metadata_file = os.path.join(self.save_path, "metadata.json")
             
-            # If forcing recrawl, delete the metadata file if it exists
-            if self.force_recrawl and os.path.exists(self.metadata_file):
-                logger.info(f"Force recrawl: removing existing metadata file {self.metadata_file}")
-                try:
-                    os.remove(self.metadata_file)
-                except Exception as e:
-                    logger.warning(f"Failed to remove metadata file: {e}")
+            # Append-only journal of crawled pages. metadata.json is only
+            # rewritten every few seconds; the journal, flushed on the same
+            # tick, keeps the pages of an interrupted crawl.
+            self.journal_file = os.path.join(self.save_path, "crawled_urls.jsonl")
+            
+            # If forcing recrawl, delete the metadata files if they exist
+            if self.force_recrawl:
+                for path in (self.metadata_file, self.journal_file):
+                    if not os.path.exists(path):
+                        continue
+                    logger.info(f"Force recrawl: removing existing metadata file {path}")
+                    try:
+                        os.remove(path)
+                    except Exception as e:
+                        logger.warning(f"Failed to remove metadata file: {e}")
             
             self.metadata = self._load_metadata()
+            self._replay_journal()
+            self._journal = open(self.journal_file, 'ab', buffering=1 << 16)
+            
+            # metadata.json is refreshed in the background while pages come in,
+            # so it is never more than METADATA_FLUSH_INTERVAL seconds stale
+            self._metadata_lock = threading.Lock()
+            self._metadata_dirty = threading.Event()
+            self._stop_writer = threading.Event()
+            self._writer = None
+            
+            # URLs already scheduled in this run, so links seen on many pages
+            # are only requested once
+            self._seen = _new_seen_set()
+            for url in self.start_urls:
+                self._seen.add(_url_key(url[:-1] if url.endswith('/') else url))
             
             # Extract domains from start URLs
             self.base_domains = []
             self.base_scheme = 'https'  # Default
             
+            # Only the scheme and host are needed, no full urlparse
             for url in self.start_urls:
-                parsed_url = urlparse(url)
-                domain = parsed_url.netloc
+                m = _NETLOC_RE.match(url)
+                if not m:
+                    continue
+                scheme, domain = m.group(1), m.group(2).lower()
                 if domain and domain not in self.base_domains:
                     self.base_domains.append(domain)
-                if parsed_url.scheme:
-                    self.base_scheme = parsed_url.scheme
+                self.base_scheme = scheme
             
             # Define allowed domains
             allowed_domains = self.base_domains if not self.follow_subdomains else None
             
-            # Create rules based on the parameters
-            rules = [
-                Rule(
-                    LinkExtractor(allow=[], deny_extensions=[], unique=True),
-                    callback='parse_item',
-                    follow=True,
-                    process_links='process_links',
-                    cb_kwargs={'depth': 1}
-                )
-            ]
-            
             # Set allowed domains
             if allowed_domains:
                 self.allowed_domains = allowed_domains
             
-            # Set rules
-            self.rules = rules
+            # Link filter specialized for this crawl's settings
+            self._follow = self._compile_link_filter()
             
-            # Initialize statistics
+            # Initialize statistics. Elapsed time is measured on the monotonic
+            # clock so wall clock adjustments don't skew the crawl duration
+            self._started = time.monotonic()
             self.stats = {
                 'pages_crawled': 0,
                 'start_time': datetime.now().isoformat(),
@@ -109,19 +261,70 @@ if SCRAPY_AVAILABLE:
                 'max_depth': self.max_depth
             }
             
+            # Kept up to date per page, so the summary never rescans crawled_urls.
+            # Seeded from the pages a resumed crawl loaded or replayed, which
+            # pages_crawled counts as well.
+            self._domains = set()
+            self._max_depth_reached = 0
+            for url, entry in self.metadata.get("crawled_urls", {}).items():
+                self._domains.add(_netloc(url))
+                depth = entry.get("depth", 0)
+                if depth > self._max_depth_reached:
+                    self._max_depth_reached = depth
+            
             # Make sure crawled_urls exists in metadata
             if "crawled_urls" not in self.metadata:
                 self.metadata["crawled_urls"] = {}
                 
-            # Initialize CrawlSpider
+            # Initialize Spider
             super(VibeCrawlSpider, self).__init__(*args, **kwargs)
         
+        def _compile_link_filter(self):
+            """
+            Build the per-link follow predicate once.
+            
+            The predicate returns True for links that should be scheduled and
+            marks them as seen, so each link is hashed only once.
+            
+            The domain mode and base domains never change during a crawl, so the
+            branch on them is taken here rather than for every extracted link.
+            Off-site links are dropped before a Request is ever built for them.
+            """
+            seen = self._seen
+            
+            if self.follow_subdomains or not self.base_domains:
+                def follow(url):
+                    if url.split('?', 1)[0].lower().endswith(_SKIP_EXTS):
+                        return False
+                    key = _url_key(url)
+                    if key in seen:
+                        return False
+                    seen.add(key)
+                    return True
+                return follow
+            
+            domains = frozenset(self.base_domains)
+            subdomain_suffixes = tuple('.' + domain for domain in domains)
+            
+            def follow(url):
+                host = _netloc(url)
+                if host not in domains and not host.endswith(subdomain_suffixes):
+                    return False
+                if url.split('?', 1)[0].lower().endswith(_SKIP_EXTS):
+                    return False
+                key = _url_key(url)
+                if key in seen:
+                    return False
+                seen.add(key)
+                return True
+            return follow
+        
         def _load_metadata(self):
             """Load metadata from previous crawls if available."""
             try:
                 if os.path.exists(self.metadata_file):
-                    with open(self.metadata_file, 'r') as f:
-                        return json.load(f)
+                    with open(self.metadata_file, 'rb') as f:
+                        return _loads(f.read())
             except Exception as e:
                 logger.warning(f"Could not load metadata: {str(e)}")
             
@@ -133,8 +336,65 @@ if SCRAPY_AVAILABLE:
                 "start_urls": getattr(self, 'start_urls', [])
             }
         
+        def _replay_journal(self):
+            """Merge pages journaled by an interrupted crawl into the metadata."""
+            if not os.path.exists(self.journal_file):
+                return
+            
+            crawled_urls = self.metadata.setdefault("crawled_urls", {})
+            replayed = 0
+            line = b'\n'
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        # Torn last line of a killed crawl
+                        continue
+                    crawled_urls[entry.pop("url")] = entry
+                    replayed += 1
+            
+            # Terminate a torn last line so new entries start on their own line
+            if not line.endswith(b'\n'):
+                with open(self.journal_file, 'ab') as f:
+                    f.write(b'\n')
+            
+            if replayed:
+                logger.info(f"Recovered {replayed} pages from {self.journal_file}")
+        
+        METADATA_FLUSH_INTERVAL = 5.0
+        
+        def _writer_loop(self):
+            """Write metadata.json whenever pages were added since the last write."""
+            while not self._stop_writer.wait(self.METADATA_FLUSH_INTERVAL):
+                if not self._metadata_dirty.is_set():
+                    continue
+                self._metadata_dirty.clear()
+                try:
+                    # Get journaled pages to disk each tick, so an interrupted
+                    # crawl loses at most one interval of them
+                    with self._metadata_lock:
+                        self._journal.flush()
+                    self._update_metadata()
+                except Exception as e:
+                    logger.warning(f"Error updating metadata: {str(e)}")
+        
         def _update_metadata(self):
             """Update and save metadata after crawling."""
+            # Serialize under the lock, parse_item keeps adding pages meanwhile.
+            # Compact JSON keeps the lock short; it is rewritten periodically.
+            with self._metadata_lock:
+                self._refresh_metadata_stats()
+                data = _dumps_line(self.metadata)
+            
+            # Write atomically so readers never see a half-written file
+            tmp_file = self.metadata_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.metadata_file)
+        
+        def _refresh_metadata_stats(self):
+            """Update the summary fields of the metadata."""
             self.metadata["last_crawl"] = datetime.now().isoformat()
             self.metadata["pages_crawled"] = len(self.metadata["crawled_urls"])
             self.metadata["start_urls"] = self.start_urls
@@ -144,119 +404,182 @@ if SCRAPY_AVAILABLE:
                 self.metadata["crawl_stats"] = {}
                 
             # Update crawl stats
+            now = time.time()
+            elapsed = time.monotonic() - self._started
             self.metadata["crawl_stats"]["pages_crawled"] = self.stats['pages_crawled']
-            self.metadata["crawl_stats"]["start_time"] = time.time() - (self.stats.get('elapsed_time_seconds', 0))
-            self.metadata["crawl_stats"]["end_time"] = time.time()
-            self.metadata["crawl_stats"]["duration"] = self.stats.get('elapsed_time_seconds', 0)
+            self.metadata["crawl_stats"]["start_time"] = now - elapsed
+            self.metadata["crawl_stats"]["end_time"] = now
+            self.metadata["crawl_stats"]["duration"] = elapsed
             self.metadata["crawl_stats"]["max_depth"] = self.max_depth
+            self.metadata["crawl_stats"]["max_depth_reached"] = self._max_depth_reached
+            self.metadata["crawl_stats"]["domains"] = sorted(self._domains)
             self.metadata["crawl_stats"]["max_pages"] = self.crawler.settings.getint('CLOSESPIDER_PAGECOUNT')
-            
-            # Save to file
-            with open(self.metadata_file, 'w') as f:
-                json.dump(self.metadata, f, indent=2)
         
-        def parse_start_url(self, response):
+        def parse(self, response):
             """Process the start URL."""
-            return self.parse_item(response, depth=0)
+            return self.parse_item(response)
         
-        def process_links(self, links):
-            """Process links to normalize URLs and apply depth limiting."""
+        def process_links(self, response, links):
+            """
+            Resolve the links of a page and keep the ones to schedule.
+            
+            Args:
+                response: Response the links were extracted from
+                links: Raw href values
+                
+            Returns:
+                List of normalized absolute URLs not scheduled before
+            """
             processed_links = []
             
             for link in links:
-                # Skip non-HTTP links and problematic URLs
-                if link.url.startswith(('mailto:', 'tel:', 'fax:', 'javascript:')) or \
-                   (':' in link.url and not link.url.startswith(('http://', 'https://'))):
-                    continue
-                
                 try:
-                    # Normalize the URL
-                    url = urldefrag(link.url)[0]  # Remove fragments
+                    url = response.urljoin(link.strip())
+                    
+                    # Skip non-HTTP links (mailto:, tel:, fax:, javascript:, ...).
+                    # urljoin made every URL absolute, so one prefix check is enough
+                    if not url.startswith(('http://', 'https://')):
+                        continue
+                    
+                    # Normalize the URL: drop the fragment with a plain string
+                    # slice, urldefrag would re-parse the whole URL
+                    frag = url.find('#')
+                    if frag != -1:
+                        url = url[:frag]
                     
                     # Remove trailing slashes for consistency
                     if url.endswith('/'):
                         url = url[:-1]
                     
-                    # Update the link
-                    link.url = url
-                    processed_links.append(link)
+                    # Skip binary files, off-site and already scheduled URLs
+                    if not self._follow(url):
+                        continue
+                    
+                    processed_links.append(url)
                 except Exception as e:
-                    logger.warning(f"Error processing link {link.url}: {str(e)}")
+                    logger.warning(f"Error processing link {link}: {str(e)}")
             
             return processed_links
         
-        def parse_item(self, response, depth=1):
+        def _persist(self, page_dir, html_name, html_bytes, page_metadata_bytes):
+            """Write a page's HTML and metadata files (runs in a worker thread)."""
+            os.makedirs(page_dir, exist_ok=True)
+            if html_name.endswith('.gz'):
+                # zlib is thread-safe and releases the GIL while compressing.
+                # Level 1 still shrinks HTML several times at little CPU cost.
+                html_bytes = gzip.compress(html_bytes, compresslevel=1)
+            _write_file(os.path.join(page_dir, html_name), html_bytes)
+            _write_file(os.path.join(page_dir, "metadata.json"), page_metadata_bytes)
+        
+        def parse_item(self, response):
             """Parse a crawled page and save its data."""
-            # Check depth
-            if depth > self.max_depth:
-                return
+            # Scrapy's DepthMiddleware tracks the depth of every request (0 for
+            # the start URLs) and drops requests beyond DEPTH_LIMIT
+            depth = response.meta.get('depth', 0)
             
             url = response.url
             logger.info(f"Crawling [{self.stats['pages_crawled'] + 1}]: {url} (depth {depth})")
             
-            # Extract content
-            html_content = response.body.decode('utf-8', errors='replace')
+            # Keep the body as bytes: it is only stored and measured, and readers
+            # decode it themselves (as UTF-8, replacing invalid bytes)
+            html_bytes = response.body
+            html_length = len(html_bytes)
             
-            # Create a hash of the URL for the file path
-            url_hash = hashlib.md5(url.encode()).hexdigest()
+            # Create a hash of the URL for the file path. Page directories are
+            # sharded by the first two hex digits (save_path/ab/ab3f...) so no
+            # single directory grows to hundreds of thousands of entries. The
+            # recorded "hash" is that relative path; legacy crawls stay flat.
+            url_hash = _url_hash(url, legacy=self.legacy_url_hash)
+            if not self.legacy_url_hash:
+                url_hash = f"{url_hash[:2]}/{url_hash}"
             page_dir = os.path.join(self.save_path, url_hash)
-            os.makedirs(page_dir, exist_ok=True)
             
-            # Save the HTML content
-            with open(os.path.join(page_dir, "page.html"), 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # Compress zstd here: the compressor is not thread-safe. gzip
+            # compression happens in the writer thread.
+            if self._zstd:
+                html_name = "page.html.zst"
+                html_bytes = self._zstd.compress(html_bytes)
+            elif self.compress_html:
+                html_name = "page.html.gz"
+            else:
+                html_name = "page.html"
             
             # Extract links
-            links = [link for link in response.css('a::attr(href)').getall()]
+            links = response.xpath(_LINKS_XPATH).getall()
+            
+            # One timestamp serves both the page and the global metadata
+            now = datetime.now().isoformat()
             
             # Save page metadata
             page_metadata = {
                 "url": url,
-                "crawl_time": datetime.now().isoformat(),
+                "crawl_time": now,
                 "depth": depth,
                 "links": links,
-                "html_length": len(html_content)
+                "html_length": html_length
             }
             
-            with open(os.path.join(page_dir, "metadata.json"), 'w', encoding='utf-8') as f:
-                json.dump(page_metadata, f, indent=2)
+            # Write the page files on the reactor's thread pool so disk I/O
+            # doesn't hold up downloads. Per-page metadata is only read by
+            # tools, write it compact.
+            d = threads.deferToThread(self._persist, page_dir, html_name, html_bytes,
+                                      _dumps_line(page_metadata))
+            d.addErrback(lambda failure: logger.error(f"Error saving {url}: {failure.value}"))
             
-            # Update global metadata
-            self.metadata["crawled_urls"][url] = {
-                "last_visit": datetime.now().isoformat(),
+            # Update global metadata. The links are only kept in the page's own
+            # metadata.json, repeating them here would double the largest field
+            entry = {
+                "last_visit": now,
                 "depth": depth,
                 "hash": url_hash,
-                "links": links,
-                "html_length": len(html_content)
+                "html_length": html_length
             }
+            with self._metadata_lock:
+                self.metadata["crawled_urls"][url] = entry
+                self._domains.add(_netloc(url))
+                if depth > self._max_depth_reached:
+                    self._max_depth_reached = depth
+                
+                # Journal the page instead of rewriting the whole metadata file.
+                # Written under the lock the writer thread flushes it with.
+                try:
+                    self._journal.write(_dumps_line(dict(entry, url=url)))
+                except Exception as e:
+                    logger.warning(f"Error updating metadata: {str(e)}")
             
-            # Save metadata after each page
-            try:
-                self._update_metadata()
-            except Exception as e:
-                logger.warning(f"Error updating metadata: {str(e)}")
+            # Let the background writer refresh metadata.json
+            self._metadata_dirty.set()
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name="metadata-writer", daemon=True)
+                self._writer.start()
             
             # Update the statistics
             self.stats['pages_crawled'] += 1
             
-            # Check if we need to follow links at this depth
+            # Follow the links we already extracted, no second pass over the page
             if depth < self.max_depth:
-                # The CrawlSpider will handle following links based on the rules
-                pass
+                for link_url in self.process_links(response, links):
+                    yield scrapy.Request(link_url, callback=self.parse_item)
             
             # Return item for the pipeline
-            return {
+            yield {
                 "url": url,
                 "depth": depth,
                 "links": links,
-                "html_length": len(html_content)
+                "html_length": html_length
             }
             
         def closed(self, reason):
             """Called when the crawler is closed."""
-            # Update and save the metadata one last time
+            # Save the consolidated metadata; the journal is only needed
+            # until then
             try:
+                self._stop_writer.set()
+                if self._writer is not None:
+                    self._writer.join()
+                self._journal.close()
                 self._update_metadata()
+                os.remove(self.journal_file)
                 logger.info(f"Crawl finished, processed {self.stats['pages_crawled']} pages")
             except Exception as e:
                 logger.error(f"Error saving final metadata: {str(e)}")
@@ -277,7 +600,13 @@ def crawl_with_scrapy(
     generate_graph=False,
     graph_type=None,
     enable_caching=False,
-    force_recrawl=True
+    force_recrawl=True,
+    legacy_url_hash=False,
+    concurrent_requests=16,
+    compress_html=False,
+    per_domain_concurrency=8,
+    autothrottle=True,
+    http2=False
 ):
     """
     Crawl a website using Scrapy.
@@ -298,6 +627,19 @@ def crawl_with_scrapy(
         graph_type: Not used in this version
         enable_caching: Whether to enable HTTP caching (default: False)
         force_recrawl: Force recrawling pages even if they have been visited before
+        legacy_url_hash: Name page directories with MD5 as older versions did (default: False)
+        concurrent_requests: Maximum number of requests in flight across all domains.
+            Politeness (delay, per-domain limit) is still applied per host.
+        compress_html: Save pages compressed, as page.html.zst with zstandard installed
+            or as page.html.gz otherwise
+        per_domain_concurrency: Maximum number of requests in flight to one domain.
+            This is the effective limit for single-site crawls; raise
+            concurrent_requests instead when crawling many domains.
+        autothrottle: Adapt the delay to each server's latency with Scrapy's AutoThrottle,
+            aiming for per_domain_concurrency requests in flight per domain. `delay`
+            is then the start and minimum delay. Disable for fixed-delay benchmarks.
+        http2: Download https:// URLs over HTTP/2, multiplexing requests to a host on
+            one connection (requires: pip install "Twisted[http2]")
         
     Returns:
         Dictionary with crawl statistics or int with pages crawled count
@@ -340,7 +682,11 @@ def crawl_with_scrapy(
     settings = {
         'USER_AGENT': user_agent or 'vibe-scraper (+https://github.com/l0rtk/vibe-scraping)',
         'ROBOTSTXT_OBEY': respect_robots_txt,
-        'DOWNLOAD_DELAY': delay,
+        'DOWNLOAD_DELAY': delay,  # Scrapy already randomizes it (0.5x-1.5x) per host
+        'AUTOTHROTTLE_ENABLED': autothrottle,
+        'AUTOTHROTTLE_START_DELAY': delay,
+        'AUTOTHROTTLE_MAX_DELAY': 10.0,
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': float(per_domain_concurrency),
         'CLOSESPIDER_PAGECOUNT': max_pages,
         'DEPTH_LIMIT': max_depth,
         'DEPTH_PRIORITY': 1,
@@ -349,12 +695,21 @@ def crawl_with_scrapy(
         'COOKIES_ENABLED': True,
         'HTTPCACHE_ENABLED': enable_caching,  # Default to False
         'HTTPCACHE_EXPIRATION_SECS': 43200,  # 12 hours
-        'HTTPCACHE_DIR': 'httpcache',
+        # Absolute, so the cache lives with the crawl data that force_recrawl clears
+        'HTTPCACHE_DIR': os.path.abspath(httpcache_dir),
         'HTTPCACHE_IGNORE_HTTP_CODES': [503, 504, 505, 500, 400, 401, 402, 403, 404],
         'HTTPCACHE_STORAGE': 'scrapy.extensions.httpcache.FilesystemCacheStorage',
         'LOG_LEVEL': 'INFO',
-        'CONCURRENT_REQUESTS': 16,  # Higher concurrency for faster crawling
-        'CONCURRENT_REQUESTS_PER_DOMAIN': 8,
+        'CONCURRENT_REQUESTS': concurrent_requests,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': per_domain_concurrency,
+        # Don't let one busy domain's backlog starve the others
+        'SCHEDULER_PRIORITY_QUEUE': 'scrapy.pqueues.DownloaderAwarePriorityQueue',
+        # Page files are written on the reactor thread pool, which also runs DNS lookups
+        'REACTOR_THREADPOOL_MAXSIZE': 40,
+        'DNSCACHE_ENABLED': True,
+        'DNSCACHE_SIZE': 500000,
+        'DNS_TIMEOUT': 5,
+        'DOWNLOAD_TIMEOUT': 30,
         'RETRY_ENABLED': True,
         'RETRY_TIMES': 3,
         'RETRY_HTTP_CODES': [500, 502, 503, 504, 408],
@@ -362,6 +717,16 @@ def crawl_with_scrapy(
         'DUPEFILTER_CLASS': 'scrapy.dupefilters.BaseDupeFilter' if force_recrawl else 'scrapy.dupefilters.RFPDupeFilter',
     }
     
+    if http2:
+        try:
+            import h2  # noqa: F401
+            settings['DOWNLOAD_HANDLERS'] = {
+                'https': 'scrapy.core.downloader.handlers.http2.H2DownloadHandler',
+            }
+        except ImportError:
+            logger.warning('HTTP/2 support is not installed, using HTTP/1.1. '
+                           'Install with: pip install "Twisted[http2]"')
+    
     # Update with additional settings if provided
     if additional_settings:
         settings.update(additional_settings)
@@ -378,7 +743,9 @@ def crawl_with_scrapy(
         follow_subdomains=follow_external_links,
         respect_robots=respect_robots_txt,
         save_path=save_path,
-        force_recrawl=force_recrawl
+        force_recrawl=force_recrawl,
+        legacy_url_hash=legacy_url_hash,
+        compress_html=compress_html
     )
     
     # Run the crawler and wait until it finishes
@@ -387,18 +754,110 @@ def crawl_with_scrapy(
     # Load the metadata file to get statistics
     metadata_file = os.path.join(save_path, "metadata.json")
     try:
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        with open(metadata_file, 'rb') as f:
+            metadata = _loads(f.read())
         
         # Return a dictionary with crawl statistics
+        crawl_stats = metadata.get('crawl_stats', {})
         return {
             'pages_crawled': metadata.get('pages_crawled', 0),
             'start_urls': urls,
             'max_depth': max_depth,
+            'max_depth_reached': crawl_stats.get('max_depth_reached', 0),
+            'domains': crawl_stats.get('domains', []),
             'max_pages': max_pages,
             'save_path': save_path
         }
     except Exception as e:
         logger.error(f"Error loading metadata: {str(e)}")
         # Fallback to returning just the count or 0 if it couldn't be determined
-        return metadata.get('pages_crawled', 0) if 'metadata' in locals() else 0 
\ No newline at end of file
+        return metadata.get('pages_crawled', 0) if 'metadata' in locals() else 0 
+
+def _crawl_shard(kwargs):
+    """Run crawl_with_scrapy for one shard (target of a worker process)."""
+    crawl_with_scrapy(**kwargs)
+
+
+def crawl_with_scrapy_parallel(start_urls, save_path="crawled_data", num_workers=4, max_pages=1000, **kwargs):
+    """
+    Crawl several sites at once with one Scrapy process per shard.
+    
+    A CrawlerProcess is bound to a single reactor and core, so start URLs are
+    sharded by domain over `num_workers` child processes. Each shard saves into
+    its own subdirectory (w0, w1, ...) and the shard metadata is merged into
+    save_path/metadata.json afterwards. Merged page hashes include the shard
+    directory (e.g. "w0/<hash>"), so HTMLProcessor and the visualizer read the
+    merged crawl like any other.
+    
+    Args:
+        start_urls: List of URLs to start crawling from
+        save_path: Directory to save the crawled data
+        num_workers: Maximum number of crawler processes
+        max_pages: Maximum number of pages to crawl, split evenly over the shards
+        **kwargs: Other crawl_with_scrapy arguments, applied to every shard
+        
+    Returns:
+        Dictionary with crawl statistics
+    """
+    import multiprocessing
+    import zlib
+    
+    if isinstance(start_urls, str):
+        start_urls = [start_urls]
+    if not start_urls:
+        raise ValueError("No start URLs provided")
+    
+    # Same domain always goes to the same shard, so shards never overlap
+    shards = [[] for _ in range(max(1, num_workers))]
+    for url in start_urls:
+        domain = _netloc(url)
+        shards[zlib.crc32(domain.encode()) % len(shards)].append(url)
+    shards = [shard for shard in shards if shard]
+    
+    pages_per_shard = max(1, max_pages // len(shards))
+    os.makedirs(save_path, exist_ok=True)
+    
+    processes = []
+    for i, shard in enumerate(shards):
+        shard_kwargs = dict(kwargs, start_urls=shard, save_path=os.path.join(save_path, f"w{i}"),
+                            max_pages=pages_per_shard)
+        process = multiprocessing.Process(target=_crawl_shard, args=(shard_kwargs,))
+        process.start()
+        processes.append(process)
+    
+    for i, process in enumerate(processes):
+        process.join()
+        if process.exitcode != 0:
+            logger.error(f"Crawler process for shard w{i} exited with code {process.exitcode}")
+    
+    # Merge the shard metadata
+    crawled_urls = {}
+    for i in range(len(shards)):
+        shard_metadata_file = os.path.join(save_path, f"w{i}", "metadata.json")
+        try:
+            with open(shard_metadata_file, 'rb') as f:
+                shard_metadata = _loads(f.read())
+        except Exception as e:
+            logger.warning(f"Could not load metadata of shard w{i}: {str(e)}")
+            continue
+        for url, entry in shard_metadata.get("crawled_urls", {}).items():
+            entry["hash"] = f"w{i}/{entry['hash']}"
+            crawled_urls[url] = entry
+    
+    metadata = {
+        "last_crawl": datetime.now().isoformat(),
+        "crawled_urls": crawled_urls,
+        "pages_crawled": len(crawled_urls),
+        "start_urls": start_urls,
+        "shards": [f"w{i}" for i in range(len(shards))]
+    }
+    with open(os.path.join(save_path, "metadata.json"), 'wb') as f:
+        f.write(_dumps_line(metadata))
+    
+    return {
+        'pages_crawled': len(crawled_urls),
+        'start_urls': start_urls,
+        'max_depth': kwargs.get('max_depth', 5),
+        'max_pages': max_pages,
+        'save_path': save_path
+    }
@@ -347,7 +347,7 @@ def scrape_with_selenium(url, wait_time=10, scroll=True, headless=False, undetec
         
         # Clean up the content
         for script in soup(["script", "style"]):
-            script.extract()
+            script.decompose()
         
         # Get the text
         text = soup.get_text(separator=' ', strip=True)
@@ -381,7 +381,7 @@ if __name__ == "__main__":
         
         # Clean up the content
         for script in soup(["script", "style"]):
-            script.extract()
+            script.decompose()
         
         # Extract text
         text = soup.get_text(separator=' ', strip=True)
@@ -7,6 +7,7 @@ including network graphs of crawled pages and their relationships.
 
 import os
 import json
+import functools
 import networkx as nx
 import matplotlib.pyplot as plt
 from urllib.parse import urlparse
@@ -22,6 +23,35 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=200_000)
+def _cached_urlparse(url):
+    """Memoized urlparse; the same URLs are parsed many times while building graphs."""
+    return urlparse(url)
+
+def _load_crawl_metadata(crawl_data_path):
+    """
+    Load a crawl's metadata.json with the outgoing links of every page.
+    
+    The global metadata doesn't repeat each page's links; they are read from
+    the page's own metadata.json (older crawls that still carry them inline
+    are used as they are).
+    """
+    with open(os.path.join(crawl_data_path, "metadata.json"), 'r') as f:
+        metadata = json.load(f)
+    
+    for data in metadata.get("crawled_urls", {}).values():
+        if "links" in data or not data.get("hash"):
+            continue
+        page_metadata_file = os.path.join(crawl_data_path, data["hash"], "metadata.json")
+        try:
+            with open(page_metadata_file, 'r') as f:
+                data["links"] = json.load(f).get("links", [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load links from {page_metadata_file}: {str(e)}")
+            data["links"] = []
+    
+    return metadata
+
 def generate_crawl_graph(crawl_data_path, output_file=None, max_nodes=100, title=None, 
                         node_size=300, width=12, height=8, with_labels=True, 
                         use_domain_colors=True, edge_color='gray'):
@@ -55,8 +85,7 @@ def generate_crawl_graph(crawl_data_path, output_file=None, max_nodes=100, title
         return None
     
     try:
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        metadata = _load_crawl_metadata(crawl_data_path)
     except Exception as e:
         logger.error(f"Error loading metadata: {str(e)}")
         return None
@@ -150,7 +179,7 @@ def generate_crawl_graph(crawl_data_path, output_file=None, max_nodes=100, title
         domain_to_color = {}
         
         for url in G.nodes():
-            domain = urlparse(url).netloc
+            domain = _cached_urlparse(url).netloc
             if domain not in domain_to_color:
                 color_index = len(domain_to_color) % 20
                 domain_to_color[domain] = colors[color_index]
@@ -200,7 +229,7 @@ def generate_crawl_graph(crawl_data_path, output_file=None, max_nodes=100, title
         # Create shorter labels for better readability
         labels = {}
         for url in G.nodes():
-            parsed = urlparse(url)
+            parsed = _cached_urlparse(url)
             path = parsed.path[:20] + "..." if len(parsed.path) > 20 else parsed.path
             if url == start_url:
                 # Make the start URL label more noticeable
@@ -246,8 +275,7 @@ def generate_domain_graph(crawl_data_path, output_file=None, title=None,
         return None
     
     try:
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        metadata = _load_crawl_metadata(crawl_data_path)
     except Exception as e:
         logger.error(f"Error loading metadata: {str(e)}")
         return None
@@ -273,7 +301,7 @@ def generate_domain_graph(crawl_data_path, output_file=None, title=None,
     
     # Process URLs and build domain-level graph
     for url, data in crawled_urls.items():
-        source_domain = urlparse(url).netloc
+        source_domain = _cached_urlparse(url).netloc
         
         # Count domains
         if source_domain not in domain_counts:
@@ -288,7 +316,7 @@ def generate_domain_graph(crawl_data_path, output_file=None, title=None,
         if "links" in data:
             for link in data["links"]:
                 if link in crawled_urls:  # Only count links that were crawled
-                    target_domain = urlparse(link).netloc
+                    target_domain = _cached_urlparse(link).netloc
                     if target_domain not in domain_connections[source_domain]:
                         domain_connections[source_domain][target_domain] = 0
                     domain_connections[source_domain][target_domain] += 1
@@ -366,8 +394,7 @@ def create_dynamic_graph(crawl_data_path, output_file=None):
         return None
     
     try:
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        metadata = _load_crawl_metadata(crawl_data_path)
     except Exception as e:
         logger.error(f"Error loading metadata: {str(e)}")
         return None
@@ -464,7 +491,7 @@ def create_dynamic_graph(crawl_data_path, output_file=None):
     
     # Add nodes to the network
     for url, data in crawled_urls.items():
-        parsed = urlparse(url)
+        parsed = _cached_urlparse(url)
         domain = parsed.netloc
         path = parsed.path[:25] + "..." if len(parsed.path) > 25 else parsed.path
         depth = data.get('depth', 'unknown')
@@ -627,8 +654,7 @@ def create_tree_visualization(crawl_data_path, output_file=None):
         return None
     
     try:
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        metadata = _load_crawl_metadata(crawl_data_path)
     except Exception as e:
         logger.error(f"Error loading metadata: {str(e)}")
         return None
@@ -772,7 +798,7 @@ def create_tree_visualization(crawl_data_path, output_file=None):
 
 def _get_display_name(url):
     """Get a shorter display name for a URL."""
-    parsed = urlparse(url)
+    parsed = _cached_urlparse(url)
     domain = parsed.netloc
     path = parsed.path
     
@@ -872,7 +898,7 @@ def _create_tree_html_template(tree_data, start_url, crawl_stats=None, num_pages
     domains = set()
     def collect_domains(node):
         if "id" in node:
-            domain = urlparse(node["id"]).netloc
+            domain = _cached_urlparse(node["id"]).netloc
             domains.add(domain)
         
         for child in node.get("children", []):